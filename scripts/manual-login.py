@@ -4,26 +4,61 @@ Manual Login Script for HydraSpecter
 Login once, sessions persist on ALL pools forever.
 
 Usage:
-    python scripts/manual-login.py [site]
+    python scripts/manual-login.py [site] [--backend {patchright,playwright}]
     python scripts/manual-login.py google
-    python scripts/manual-login.py amazon
+    python scripts/manual-login.py amazon --backend playwright
+    python scripts/manual-login.py google --hardlink
+    python scripts/manual-login.py --concurrent
+
+--hardlink shares data with pool-0 on disk where that is safe: immutable
+LevelDB table files (*.ldb, *.sst) are hardlinked, everything else is cloned
+copy-on-write where the filesystem supports it (btrfs, XFS) and copied
+otherwise. Files pools write back in place (storage-state.json, LevelDB
+logs and manifests) are never hardlinked.
+
+--concurrent checks the saved session of every site in parallel (no login).
+
+Set HYDRA_CHROMIUM_PATH to launch a specific browser binary instead of the
+backend's bundled Chromium.
 
 IMPORTANT: Chrome will be closed before launching!
 """
+import argparse
 import asyncio
-import sys
+import importlib
+import json
+import os
 import subprocess
 import shutil
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
 
-# Use patchright (patched Chromium - no Runtime.enable = no detection!)
-from patchright.async_api import async_playwright
+try:
+    import psutil
+except ImportError:  # taskkill fallback below
+    psutil = None
+
+try:
+    import fcntl
+except ImportError:  # Windows, no reflink support
+    fcntl = None
+
+# Default to patchright (patched Chromium - no Runtime.enable = no detection!)
+BACKENDS = ("patchright", "playwright")
+DEFAULT_BACKEND = "patchright"
+
+# Optional browser binary, resolved once; None keeps the backend's bundled Chromium
+EXECUTABLE_PATH = os.environ.get("HYDRA_CHROMIUM_PATH") or None
 
 HYDRA_PROFILES = Path.home() / ".hydraspecter" / "profiles"
 POOL_0 = HYDRA_PROFILES / "pool-0"
 
-SITES = {
+_RAW_SITES = {
     "google": {
         "login_url": "https://accounts.google.com/",
         "check_url": "https://mail.google.com/",
@@ -81,10 +116,59 @@ SITES = {
     },
 }
 
+# Lowercased, read-only view built once at import
+SITES = types.MappingProxyType({k.lower(): v for k, v in _RAW_SITES.items()})
+_SITE_LIST = ", ".join(SITES)
+
+
+def _get_pw(backend: str):
+    """Import the requested backend lazily so only its import graph is paid"""
+    return importlib.import_module(f"{backend}.async_api").async_playwright
+
+
+CHROME_NAMES = ("chrome.exe", "chrome")
+
 
 def kill_chrome():
     """Kill all Chrome processes to free the profile"""
     print("\n[!] Closing Chrome processes...")
+    if psutil is None:
+        _taskkill_chrome()
+        return
+
+    try:
+        chromes = [
+            p for p in psutil.process_iter(["name"])
+            if p.info["name"] and p.info["name"].lower() in CHROME_NAMES
+        ]
+        if not chromes:
+            print("[INFO] Chrome was not running")
+            return
+        killed = []
+        denied = False
+        for p in chromes:
+            try:
+                p.kill()
+                killed.append(p)
+            except psutil.NoSuchProcess:
+                # Children exit on their own once the browser process dies
+                pass
+            except psutil.Error as e:
+                # e.g. AccessDenied on another user's Chrome, keep going
+                print(f"[WARN] Could not kill Chrome (pid {p.pid}): {e}")
+                denied = True
+        # Continue as soon as the processes are gone (releases the profile lock)
+        _, alive = psutil.wait_procs(killed, timeout=3)
+        if alive:
+            print(f"[WARN] Chrome still running (pids {', '.join(str(p.pid) for p in alive)})")
+        elif not denied:
+            print("[OK] Chrome closed")
+    except Exception as e:
+        print(f"[WARN] Could not close Chrome: {e}")
+
+
+def _taskkill_chrome():
+    """Fallback for Windows installs without psutil"""
     try:
         result = subprocess.run(
             ["taskkill", "/F", "/IM", "chrome.exe"],
@@ -94,49 +178,196 @@ def kill_chrome():
         )
         if "SUCCESS" in result.stdout or result.returncode == 0:
             print("[OK] Chrome closed")
+            # Give Chrome time to release the profile
+            time.sleep(3)
         else:
             print("[INFO] Chrome was not running")
     except Exception as e:
         print(f"[WARN] Could not close Chrome: {e}")
 
 
-def sync_to_all_pools():
+# Cookies + localStorage travel as Playwright storage state (a small JSON
+# GlobalProfile injects on launch) instead of raw Chromium SQLite/LevelDB.
+# Only what storage state can't carry is still copied as profile data.
+STORAGE_STATE = POOL_0 / "storage-state.json"
+
+SYNC_ENTRIES = [
+    "storage-state.json",
+    "Default/Session Storage",
+    "Default/IndexedDB",
+    "Default/Service Worker",
+]
+
+SYNC_MANIFEST = POOL_0 / ".sync_manifest.json"
+
+
+def _scan(path: Path, rel: str, out: dict):
+    """Record (size, mtime_ns) for every file under path, keyed by relpath"""
+    if path.is_file():
+        st = path.stat()
+        out[rel] = [st.st_size, st.st_mtime_ns]
+        return
+    with os.scandir(path) as it:
+        for entry in it:
+            child = f"{rel}/{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                _scan(Path(entry.path), child, out)
+            elif entry.is_file():
+                st = entry.stat()
+                out[child] = [st.st_size, st.st_mtime_ns]
+
+
+def _subtree(files: dict, entry: str) -> dict:
+    prefix = entry + "/"
+    return {k: v for k, v in files.items() if k == entry or k.startswith(prefix)}
+
+
+def _load_manifest() -> dict:
+    try:
+        return json.loads(SYNC_MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+# LevelDB never rewrites table files (compaction writes new ones and deletes
+# the old), so these are the only synced files safe to share via hardlink.
+# Everything else (storage-state.json, *.log, MANIFEST-*, CURRENT) is
+# rewritten in place by the pool that owns it.
+LINKABLE_SUFFIXES = (".ldb", ".sst")
+
+FICLONE = 0x40049409  # linux/fs.h
+
+
+def _linkable(rel: str) -> bool:
+    return rel.endswith(LINKABLE_SUFFIXES)
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Copy-on-write clone of src, False if the filesystem can't do it"""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def _copy(src: Path, dst: Path, rel: str, mtime_ns: int, hardlink: bool):
+    # Also breaks any hardlink left by a previous --hardlink sync
+    dst.unlink(missing_ok=True)
+    if hardlink:
+        if _linkable(rel):
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                # Different filesystem or no hardlink support
+                pass
+        if _reflink(src, dst):
+            os.utime(dst, ns=(mtime_ns, mtime_ns))
+            return
+    # copyfile uses sendfile/CopyFile fast paths and skips metadata we
+    # don't need for browser data; mtime is kept so the next run can tell
+    # the copy is current
+    shutil.copyfile(src, dst)
+    os.utime(dst, ns=(mtime_ns, mtime_ns))
+
+
+def _sync_one_pool(i: int, files: dict, unchanged: set, hardlink: bool = False) -> tuple:
+    """Copy changed session data from pool-0 into pool-i.
+
+    Returns (files copied, files unchanged, ok).
+    """
+    pool_dir = HYDRA_PROFILES / f"pool-{i}"
+    pool_dir.mkdir(parents=True, exist_ok=True)
+
+    copied = skipped = 0
+    ok = True
+    for file_rel in SYNC_ENTRIES:
+        entry_files = _subtree(files, file_rel)
+        if not entry_files:
+            continue
+
+        dst_root = pool_dir / file_rel
+        # pool-0 hasn't touched this subtree since the last sync
+        if file_rel in unchanged and dst_root.exists():
+            skipped += len(entry_files)
+            continue
+
+        try:
+            for rel, (size, mtime_ns) in entry_files.items():
+                dst = pool_dir / rel
+                try:
+                    st = dst.stat()
+                    if st.st_size == size and st.st_mtime_ns == mtime_ns:
+                        # Matching data is only synced if it's linked exactly
+                        # when it should be: copies of linkable files become
+                        # links in --hardlink mode, links become copies otherwise
+                        want_link = hardlink and _linkable(rel)
+                        if want_link or st.st_nlink > 1:
+                            src_st = (POOL_0 / rel).stat()
+                            linked = os.path.samestat(st, src_st)
+                            # Can't link across filesystems, a copy is the best we get
+                            want_link = want_link and st.st_dev == src_st.st_dev
+                        else:
+                            linked = False
+                        if linked == want_link:
+                            skipped += 1
+                            continue
+                except FileNotFoundError:
+                    pass
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                _copy(POOL_0 / rel, dst, rel, mtime_ns, hardlink)
+                copied += 1
+
+            # Drop files that no longer exist in pool-0
+            if dst_root.is_dir():
+                for dirpath, _, filenames in os.walk(dst_root):
+                    for name in filenames:
+                        path = Path(dirpath) / name
+                        if path.relative_to(pool_dir).as_posix() not in entry_files:
+                            path.unlink()
+        except Exception as e:
+            print(f"[WARN] pool-{i}/{file_rel}: {e}")
+            ok = False
+
+    return copied, skipped, ok
+
+
+def sync_to_all_pools(hardlink: bool = False):
     """Copy session data from pool-0 to all other pools"""
     print("\n" + "=" * 60)
     print("SYNCING TO ALL POOLS")
     print("=" * 60)
 
-    files_to_sync = [
-        "Default/Cookies",
-        "Default/Local Storage",
-        "Default/Session Storage",
-        "Default/IndexedDB",
-        "Default/Service Worker",
-    ]
+    files = {}
+    for file_rel in SYNC_ENTRIES:
+        src = POOL_0 / file_rel
+        if src.exists():
+            _scan(src, file_rel, files)
 
-    synced = 0
-    for i in range(1, 10):  # pool-1 to pool-9
-        pool_dir = HYDRA_PROFILES / f"pool-{i}"
-        pool_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest()
+    # Switching between copies and hardlinks invalidates the last sync
+    previous = manifest.get("files", {}) if manifest.get("hardlink") == hardlink else {}
+    unchanged = {
+        file_rel for file_rel in SYNC_ENTRIES
+        if _subtree(files, file_rel) == _subtree(previous, file_rel)
+    }
 
-        for file_rel in files_to_sync:
-            src = POOL_0 / file_rel
-            dst = pool_dir / file_rel
+    # One worker per destination pool (pool-1 to pool-9), copies are I/O bound
+    with ThreadPoolExecutor(max_workers=9) as ex:
+        results = list(ex.map(lambda i: _sync_one_pool(i, files, unchanged, hardlink), range(1, 10)))
 
-            if src.exists():
-                try:
-                    dst.parent.mkdir(parents=True, exist_ok=True)
-                    if src.is_dir():
-                        if dst.exists():
-                            shutil.rmtree(dst)
-                        shutil.copytree(src, dst)
-                    else:
-                        shutil.copy2(src, dst)
-                    synced += 1
-                except Exception as e:
-                    print(f"[WARN] pool-{i}/{file_rel}: {e}")
+    copied = sum(r[0] for r in results)
+    skipped = sum(r[1] for r in results)
+
+    # Only remember this state once every pool has it, so failures get retried
+    if all(r[2] for r in results):
+        SYNC_MANIFEST.write_text(json.dumps({"hardlink": hardlink, "files": files}), encoding="utf-8")
 
-    print(f"[OK] Synced to pools 1-9 ({synced} items)")
+    print(f"[OK] Synced to pools 1-9 ({copied} files copied, {skipped} unchanged)")
 
 
 async def countdown(seconds: int, message: str):
@@ -147,163 +378,258 @@ async def countdown(seconds: int, message: str):
     print()
 
 
-async def manual_login(site_name: str):
-    """Open browser for manual login"""
-    site = SITES.get(site_name.lower())
-    if not site:
-        print(f"Unknown site: {site_name}")
-        print(f"Available: {', '.join(SITES.keys())}")
-        return False
+async def wait_for_login(seconds: int):
+    """Countdown that ends early when the user presses Enter"""
+    loop = asyncio.get_running_loop()
+    entered = loop.create_future()
 
-    POOL_0.mkdir(parents=True, exist_ok=True)
+    def read_enter():
+        if not sys.stdin.readline():
+            return  # EOF (no terminal), just let the countdown run
+        loop.call_soon_threadsafe(lambda: entered.done() or entered.set_result(None))
+
+    # stdin is read on a daemon thread so the event loop keeps servicing
+    # Playwright, and a pending read can't block interpreter exit
+    threading.Thread(target=read_enter, daemon=True).start()
+    timer = asyncio.ensure_future(countdown(seconds, ">>> Login now, Enter when done"))
+    await asyncio.wait({entered, timer}, return_when=asyncio.FIRST_COMPLETED)
+    if not timer.done():
+        timer.cancel()
+        print()
+
+
+async def wait_for_settle(page, timeout: int = 5000):
+    """Wait for the DOM, then (bounded) for the network to go quiet"""
+    await page.wait_for_load_state("domcontentloaded")
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+    except Exception:
+        # Long-polling sites never go idle, the DOM is enough
+        pass
 
+
+async def wait_for_account_chosen(page):
+    """Wait until Google leaves the account chooser and the target page loads"""
+    await page.wait_for_url(lambda u: "accountchooser" not in u, timeout=10000)
+    await wait_for_settle(page)
+
+
+async def manual_login(p, site_name: str, site: dict):
+    """Open browser for manual login"""
     print("=" * 60)
     print(f"MANUAL LOGIN: {site_name.upper()}")
     print("=" * 60)
     print(f"Profile: {POOL_0}")
     print(f"Login URL: {site['login_url']}")
 
-    # Kill Chrome to free the profile
-    kill_chrome()
-    await asyncio.sleep(3)
+    # Kill Chrome to free the profile (blocks while waiting, keep it off the loop)
+    await asyncio.to_thread(kill_chrome)
 
-    async with async_playwright() as p:
-        # Launch with patchright's patched Chromium (no Runtime.enable detection)
-        context = await p.chromium.launch_persistent_context(
-            user_data_dir=str(POOL_0),
-            headless=False,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-infobars',
-                '--disable-dev-shm-usage',
-                '--no-first-run',
-            ],
-            ignore_default_args=['--enable-automation'],
-        )
+    # patchright launches patched Chromium (no Runtime.enable detection)
+    context = await p.chromium.launch_persistent_context(
+        user_data_dir=str(POOL_0),
+        executable_path=EXECUTABLE_PATH,
+        headless=False,
+        args=[
+            '--disable-blink-features=AutomationControlled',
+            '--disable-infobars',
+            '--disable-dev-shm-usage',
+            '--no-first-run',
+        ],
+        ignore_default_args=['--enable-automation'],
+    )
 
-        page = context.pages[0] if context.pages else await context.new_page()
+    page = context.pages[0] if context.pages else await context.new_page()
 
-        print("\n[1] Opening login page...")
-        await page.goto(site["login_url"], timeout=30000)
-        await asyncio.sleep(2)
+    print("\n[1] Opening login page...")
+    await page.goto(site["login_url"], timeout=30000)
+    await wait_for_settle(page)
 
-        print("\n" + "=" * 40)
-        print(">>> YOU HAVE 40 SECONDS TO LOGIN <<<")
-        print("=" * 40)
-        print(f"URL: {page.url}")
+    print("\n" + "=" * 40)
+    print(">>> YOU HAVE 40 SECONDS TO LOGIN <<<")
+    print("(press Enter as soon as you are done)")
+    print("=" * 40)
+    print(f"URL: {page.url}")
 
-        # 40 second countdown
-        await countdown(40, ">>> Login now")
+    # 40 second countdown, or until Enter
+    await wait_for_login(40)
 
-        # Check if logged in
-        final_url = page.url
-        print(f"\n[2] Final URL: {final_url}")
+    # Check if logged in
+    final_url = page.url
+    print(f"\n[2] Final URL: {final_url}")
 
-        print("\nClosing browser...")
-        await context.close()
+    print("\nSaving storage state...")
+    await context.storage_state(path=str(STORAGE_STATE))
+
+    print("\nClosing browser...")
+    await context.close()
 
     return True
 
 
-async def test_persistence(site_name: str):
-    """Test if session persisted"""
-    site = SITES.get(site_name.lower())
-    if not site:
-        return False
+async def launch_check_context(p):
+    """Relaunch pool-0 from disk to check saved sessions"""
+    return await p.chromium.launch_persistent_context(
+        user_data_dir=str(POOL_0),
+        executable_path=EXECUTABLE_PATH,
+        headless=False,
+        args=[
+            '--disable-blink-features=AutomationControlled',
+            '--disable-infobars',
+        ],
+        ignore_default_args=['--enable-automation'],
+    )
+
+
+async def open_check_url(page, site: dict) -> str:
+    """Go to the site's check URL (past Google's account chooser), returns final URL"""
+    await page.goto(site["check_url"], timeout=30000)
+    await wait_for_settle(page)
+
+    # Handle Google account chooser
+    if "accountchooser" in page.url:
+        print("[INFO] Account chooser detected, clicking first account...")
+        try:
+            # Click the first account in the list
+            await page.click('[data-identifier]', timeout=5000)
+            await wait_for_account_chosen(page)
+        except:
+            print("[WARN] Could not click account, trying alternative...")
+            try:
+                await page.click('div[data-email]', timeout=5000)
+                await wait_for_account_chosen(page)
+            except:
+                pass
 
-    print("\n" + "=" * 60)
-    print("TESTING PERSISTENCE")
-    print("=" * 60)
+    return page.url
 
-    await asyncio.sleep(2)
 
-    async with async_playwright() as p:
-        context = await p.chromium.launch_persistent_context(
-            user_data_dir=str(POOL_0),
-            headless=False,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-infobars',
-            ],
-            ignore_default_args=['--enable-automation'],
-        )
+def is_logged_in(url: str, site_name: str, site: dict) -> bool:
+    # Check success - verify the actual host/path, not query params.
+    # Splitting off query/fragment is enough, no need to parse the URL
+    url_base = url.split("?", 1)[0].split("#", 1)[0]
+    return site["success_indicator"] in url_base or (
+        site_name.lower() == "google" and "mail.google.com/mail" in url_base
+    )
 
-        page = context.pages[0] if context.pages else await context.new_page()
 
-        print(f"[1] Going to {site['check_url']}...")
-        await page.goto(site["check_url"], timeout=30000)
-        await asyncio.sleep(3)
+async def test_persistence(p, site_name: str, site: dict):
+    """Test if session persisted (relaunches the profile from disk)"""
+    print("\n" + "=" * 60)
+    print("TESTING PERSISTENCE")
+    print("=" * 60)
 
-        # Handle Google account chooser
-        if "accountchooser" in page.url:
-            print("[INFO] Account chooser detected, clicking first account...")
-            try:
-                # Click the first account in the list
-                await page.click('[data-identifier]', timeout=5000)
-                await asyncio.sleep(5)
-            except:
-                print("[WARN] Could not click account, trying alternative...")
-                try:
-                    await page.click('div[data-email]', timeout=5000)
-                    await asyncio.sleep(5)
-                except:
-                    pass
+    context = await launch_check_context(p)
+    page = context.pages[0] if context.pages else await context.new_page()
 
-        url = page.url
-        print(f"[2] Current URL: {url}")
+    print(f"[1] Going to {site['check_url']}...")
+    url = await open_check_url(page, site)
+    print(f"[2] Current URL: {url}")
 
-        # Parse URL to check host (not query string)
+    if is_logged_in(url, site_name, site):
+        print("\n" + "=" * 40)
+        print("SUCCESS! Session persisted!")
+        print("=" * 40)
+        success = True
+    else:
+        # Only parse the URL to diagnose the failure
         parsed = urlparse(url)
-        url_host_path = f"{parsed.netloc}{parsed.path}"
+        url_host_path = parsed.netloc + parsed.path
 
-        # Check success - verify the actual host/path, not query params
-        if site["success_indicator"] in url_host_path:
-            print("\n" + "=" * 40)
-            print("SUCCESS! Session persisted!")
-            print("=" * 40)
-            success = True
-        elif site_name.lower() == "google" and "mail.google.com/mail" in url_host_path:
-            print("\n" + "=" * 40)
-            print("SUCCESS! Gmail loaded!")
-            print("=" * 40)
-            success = True
-        elif "accounts.google.com" in parsed.netloc or "/signin" in parsed.path or "/login" in parsed.path:
+        if "accounts.google.com" in parsed.netloc or "/signin" in parsed.path or "/login" in parsed.path:
             print("\n" + "=" * 40)
             print("FAIL - Still on login page (session not saved)")
             print(f"URL: {url}")
             print("=" * 40)
-            success = False
         else:
             print("\n" + "=" * 40)
             print("FAIL - Session did not persist")
             print(f"Expected: {site['success_indicator']}")
             print(f"Got: {url_host_path}")
             print("=" * 40)
-            success = False
+        success = False
 
-        await context.close()
+    await context.close()
 
     return success
 
 
+async def _check_one(context, site_name: str, site: dict):
+    page = await context.new_page()
+    try:
+        url = await open_check_url(page, site)
+        return site_name, is_logged_in(url, site_name, site), url
+    except Exception as e:
+        return site_name, False, f"error: {e}"
+    finally:
+        await page.close()
+
+
+async def verify_all(backend: str = DEFAULT_BACKEND):
+    """Check every site's session at once, one tab per site in a single context"""
+    print("=" * 60)
+    print("VERIFYING ALL SITES")
+    print("=" * 60)
+
+    await asyncio.to_thread(kill_chrome)
+
+    async_playwright = _get_pw(backend)
+    async with async_playwright() as p:
+        context = await launch_check_context(p)
+        results = await asyncio.gather(
+            *[_check_one(context, name, site) for name, site in SITES.items()]
+        )
+        await context.close()
+
+    print()
+    for name, success, url in results:
+        print(f"{'[OK]  ' if success else '[FAIL]'} {name:<14} {url}")
+
+    return all(success for _, success, _ in results)
+
+
+async def run(site_name: str, backend: str = DEFAULT_BACKEND):
+    """Login then test persistence, sharing one Playwright driver"""
+    site = SITES.get(site_name.lower())
+    if not site:
+        print(f"Unknown site: {site_name}")
+        print(f"Available: {_SITE_LIST}")
+        return False
+
+    POOL_0.mkdir(parents=True, exist_ok=True)
+
+    async_playwright = _get_pw(backend)
+    async with async_playwright() as p:
+        # Step 1: Manual login
+        await manual_login(p, site_name, site)
+
+        # Step 2: Test persistence. manual_login's context.close() waits for
+        # Chromium to exit, so the profile is free to relaunch right away
+        return await test_persistence(p, site_name, site)
+
+
 async def main():
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("site", nargs="?")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument("--hardlink", action="store_true")
+    parser.add_argument("--concurrent", action="store_true")
+    args = parser.parse_args()
+
+    if args.concurrent:
+        ok = await verify_all(args.backend)
+        sys.exit(0 if ok else 1)
+
+    if not args.site:
         print(__doc__)
-        print(f"\nAvailable sites: {', '.join(SITES.keys())}")
+        print(f"\nAvailable sites: {_SITE_LIST}")
         return
 
-    site_name = sys.argv[1]
-
-    # Step 1: Manual login
-    logged_in = await manual_login(site_name)
-
-    if logged_in:
-        # Step 2: Test persistence
-        success = await test_persistence(site_name)
+    success = await run(args.site, args.backend)
 
-        if success:
-            # Step 3: Sync to all pools
-            sync_to_all_pools()
+    if success:
+        # Step 3: Sync to all pools
+        sync_to_all_pools(hardlink=args.hardlink)
 
     print("\nDone! Sessions are now available in HydraSpecter on ALL pools.")
 
@@ -1,14 +1,127 @@
 #!/usr/bin/env python3
 """
 SeleniumBase Bridge for HydraSpecter
-Communicates via JSON lines over stdio.
+Communicates via JSON over stdio: one message per line by default, or
+length-prefixed frames ("%08x\n" + payload) when HYDRA_FRAMING=length.
+
+Binary payloads (screenshots) are written raw to the fd named by
+HYDRA_BINARY_FD when the parent provides one; the JSON line then only
+carries a {"binary": {"len": N, "mime": ...}} header for those bytes.
 """
 
+import base64
+import gzip
 import json
 import sys
 import os
+import time
 import traceback
 
+# orjson is much faster on large payloads (screenshots), json is the fallback
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+_b64encode = base64.b64encode
+
+# Polls inside the page, so waiting costs one WebDriver command instead of
+# a find_element round-trip every ~0.25s
+_WAIT_ELEMENT_JS = """
+const [selector, timeoutMs, done] = arguments;
+const deadline = Date.now() + timeoutMs;
+const check = () => {
+    let el;
+    try {
+        el = document.querySelector(selector);
+    } catch (e) {
+        return done('Invalid selector: ' + e.message);
+    }
+    // Same idea as WebDriver's is_displayed(): rendered and not visibility:hidden
+    const visible = el && (el.checkVisibility
+        ? el.checkVisibility({ visibilityProperty: true })
+        : el.getClientRects().length && getComputedStyle(el).visibility !== 'hidden');
+    if (visible) return done(true);
+    if (Date.now() > deadline) return done(false);
+    setTimeout(check, 50);
+};
+check();
+"""
+
+# Selector forms SeleniumBase understands but querySelector doesn't
+_NON_CSS_PREFIXES = (
+    '/', './', '(', 'xpath=', 'css=',
+    'link=', 'link_text=', 'partial_link=', 'partial_link_text=',
+)
+
+
+def _is_plain_css(selector):
+    return not selector.startswith(_NON_CSS_PREFIXES) and ':contains(' not in selector
+
+
+# Script errors chromedriver raises when the page navigates away mid-script
+_NAVIGATION_ERRORS = (
+    'document unloaded',
+    'Execution context was destroyed',
+    'Cannot find context with specified id',
+)
+
+
+def _is_navigation_error(error):
+    message = str(error)
+    return any(marker in message for marker in _NAVIGATION_ERRORS)
+
+
+FRAME_HEADER_SIZE = 9  # 8 hex digits + newline
+_HEX_DIGITS = frozenset(b'0123456789abcdefABCDEF')
+
+
+def _parse_frame_header(header):
+    """Payload length from a frame header, or None if it is malformed"""
+    if header[8:] != b'\n' or not all(c in _HEX_DIGITS for c in header[:8]):
+        return None
+    return int(header[:8], 16)
+
+
+def read_messages(inp, framed):
+    """Yield raw JSON messages from stdin"""
+    if framed:
+        # Exact-size reads, no scanning for newlines
+        while True:
+            header = inp.read(FRAME_HEADER_SIZE)
+            if len(header) < FRAME_HEADER_SIZE:
+                return
+            length = _parse_frame_header(header)
+            if length is None:
+                # Can't resynchronize: stop reading instead of guessing
+                sys.stderr.write(f'Invalid frame header: {header!r}\n')
+                sys.stderr.flush()
+                return
+            body = inp.read(length)
+            if len(body) < length:
+                return
+            yield body
+    else:
+        for line in iter(inp.readline, b''):
+            line = line.strip()
+            if line:
+                yield line
+
+
+class BinaryResult:
+    """Handler result sent as raw bytes over the binary side channel"""
+    __slots__ = ('data', 'mime')
+
+    def __init__(self, data, mime):
+        self.data = data
+        self.mime = mime
+
+
 def main():
     # Environment config
     profile_dir = os.environ.get('HYDRA_PROFILE_DIR', '')
@@ -18,31 +131,83 @@ def main():
     window_position = os.environ.get('HYDRA_WINDOW_POSITION', '')
 
     driver = None
+    driver_config = None
+    script_timeout = None
+    # Keep a private handle on the protocol channel, then point fd 1 at
+    # stderr: SeleniumBase and chromedriver print to stdout (e.g. driver
+    # downloads), and any stray byte there would corrupt a frame
+    sys.stdout.flush()
+    out = os.fdopen(os.dup(1), 'wb')
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    framed = os.environ.get('HYDRA_FRAMING', '') == 'length'
+
+    # Side channel for raw bytes (POSIX parents pass an extra pipe as fd 3)
+    binary_out = None
+    binary_fd = os.environ.get('HYDRA_BINARY_FD', '')
+    if binary_fd:
+        try:
+            binary_out = os.fdopen(int(binary_fd), 'wb')
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f'Binary channel unavailable: {e}\n')
+            sys.stderr.flush()
 
-    def send_response(cmd_id, success, data=None, error=None):
+    def send_response(cmd_id, success, data=None, error=None, binary=None):
         response = {'id': cmd_id, 'success': success}
         if data is not None:
             response['data'] = data
         if error is not None:
             response['error'] = error
-        print(json.dumps(response), flush=True)
+        if binary is not None:
+            response['binary'] = binary
+        payload = _dumps(response)
+        # writelines avoids concatenating (copying) large payloads
+        if framed:
+            out.writelines((b'%08x\n' % len(payload), payload))
+        else:
+            out.writelines((payload, b'\n'))
+        out.flush()
+
+    def send_binary(cmd_id, result):
+        # Bytes first, so they are already in flight when the header is read
+        binary_out.write(result.data)
+        binary_out.flush()
+        send_response(cmd_id, True, binary={'len': len(result.data), 'mime': result.mime})
 
     def init_driver(params):
-        nonlocal driver
+        nonlocal driver, driver_config, script_timeout
+        # Deliberately imported here, not at module level: SeleniumBase is a
+        # heavy import, and a missing install must surface as an init error
+        # response rather than a bridge that dies before reading stdin
         from seleniumbase import Driver
 
+        # Reuse the running browser when it was launched with the same options
+        # (skips Chrome startup); window geometry is simply re-applied below
+        config = (
+            params.get('profileDir'),
+            bool(params.get('headless', False)),
+            params.get('proxy') or None,
+        )
+        if driver is not None and config != driver_config:
+            driver.quit()
+            driver = None
+
         # Parse window size
         ws = params.get('windowSize', {})
         width = ws.get('width', 1280)
         height = ws.get('height', 720)
 
-        # UC mode options
-        driver = Driver(
-            uc=True,  # Undetected Chrome mode
-            headless=params.get('headless', False),
-            user_data_dir=params.get('profileDir'),
-            proxy=params.get('proxy') or None,
-        )
+        if driver is None:
+            profile, headless, proxy = config
+            # UC mode options
+            driver = Driver(
+                uc=True,  # Undetected Chrome mode
+                headless=headless,
+                user_data_dir=profile,
+                proxy=proxy,
+            )
+            driver_config = config
+            script_timeout = None
 
         # Set window size
         driver.set_window_size(width, height)
@@ -97,17 +262,31 @@ def main():
         return True
 
     def screenshot(params):
-        import base64
-        # Take screenshot and return as base64
         png_data = driver.get_screenshot_as_png()
-        return base64.b64encode(png_data).decode('utf-8')
+        if binary_out is not None:
+            return BinaryResult(png_data, 'image/png')
+        # No side channel: return as base64
+        return _b64encode(png_data).decode('utf-8')
 
     def snapshot(params):
         format_type = params.get('format', 'html')
         if format_type == 'html':
-            return {'content': driver.page_source, 'format': 'html'}
+            result = {'content': driver.page_source, 'format': 'html'}
         else:
-            return {'content': driver.get_page_source(), 'format': 'text'}
+            result = {'content': driver.get_page_source(), 'format': 'text'}
+
+        # HTML compresses 5-10x, worth it for multi-MB pages
+        if params.get('encoding') == 'gzip':
+            result['content'] = _b64encode(gzip.compress(result['content'].encode('utf-8'))).decode('utf-8')
+            result['encoding'] = 'gzip'
+        return result
+
+    def snapshot_hash(params):
+        # Cheap change detection: computed in the page, ~30 bytes over the wire
+        length, elements = driver.execute_script(
+            "return [document.documentElement.outerHTML.length, document.getElementsByTagName('*').length]"
+        )
+        return {'length': length, 'elements': elements}
 
     def evaluate(params):
         script = params.get('script')
@@ -116,12 +295,45 @@ def main():
         return driver.execute_script(script)
 
     def wait_element(params):
+        nonlocal script_timeout
         selector = params.get('selector')
         timeout = params.get('timeout', 10)
         if not selector:
             raise ValueError('Selector required')
-        driver.wait_for_element(selector, timeout=timeout)
-        return True
+
+        # XPath, link text, :contains() etc. need SeleniumBase's own polling
+        if not _is_plain_css(selector):
+            driver.wait_for_element(selector, timeout=timeout)
+            return True
+
+        from selenium.common.exceptions import WebDriverException
+
+        # Only ever raise the driver-wide script timeout, evaluate() relies on it too
+        if script_timeout is None:
+            script_timeout = driver.timeouts.script
+        if script_timeout < timeout + 5:
+            script_timeout = timeout + 5
+            driver.set_script_timeout(script_timeout)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f'Element {selector} was not visible after {timeout} seconds')
+            try:
+                found = driver.execute_async_script(_WAIT_ELEMENT_JS, selector, int(remaining * 1000))
+            except WebDriverException as e:
+                # A navigation (e.g. after clicking submit) unloads the document
+                # mid-wait; keep polling on the new page with the time left
+                if _is_navigation_error(e):
+                    time.sleep(0.05)
+                    continue
+                raise
+            if isinstance(found, str):
+                raise ValueError(found)
+            if not found:
+                raise TimeoutError(f'Element {selector} was not visible after {timeout} seconds')
+            return True
 
     def scroll(params):
         if 'selector' in params:
@@ -135,11 +347,21 @@ def main():
                 driver.execute_script(f'window.scrollBy(0, -{amount})')
         return True
 
+    def reset(params):
+        # Return to a blank page between tasks without tearing down Chrome
+        if not driver:
+            raise ValueError('Driver not initialized')
+        driver.execute_script('window.stop()')
+        driver.get('about:blank')
+        return True
+
     def close(params):
-        nonlocal driver
+        nonlocal driver, driver_config, script_timeout
         if driver:
             driver.quit()
             driver = None
+            driver_config = None
+            script_timeout = None
         return True
 
     def get_url(params):
@@ -153,6 +375,26 @@ def main():
         driver.uc_gui_click_captcha()
         return True
 
+    def batch(params):
+        # Run several commands in one round-trip, stopping at the first failure
+        results = []
+        for op in params.get('ops', []):
+            method = op.get('method', '')
+            handler = handlers.get(method)
+            if handler is None:
+                results.append({'success': False, 'error': f'Unknown method: {method}'})
+                break
+            try:
+                result = handler(op.get('params', {}))
+            except Exception as e:
+                results.append({'success': False, 'error': str(e)})
+                break
+            if isinstance(result, BinaryResult):
+                # Binary results can't share one frame, inline them as base64
+                result = _b64encode(result.data).decode('utf-8')
+            results.append({'success': True, 'data': result})
+        return {'results': results}
+
     # Command handlers
     handlers = {
         'init': init_driver,
@@ -162,40 +404,51 @@ def main():
         'fill': fill,
         'screenshot': screenshot,
         'snapshot': snapshot,
+        'snapshot_hash': snapshot_hash,
         'evaluate': evaluate,
         'wait_element': wait_element,
         'scroll': scroll,
+        'reset': reset,
         'close': close,
         'get_url': get_url,
         'get_title': get_title,
         'solve_turnstile': solve_turnstile,
+        'batch': batch,
     }
 
     # Main loop: read JSON commands from stdin
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
-
-        try:
-            cmd = json.loads(line)
-            cmd_id = cmd.get('id', '')
-            method = cmd.get('method', '')
-            params = cmd.get('params', {})
-
-            if method not in handlers:
-                send_response(cmd_id, False, error=f'Unknown method: {method}')
-                continue
-
+    try:
+        for message in read_messages(sys.stdin.buffer, framed):
             try:
-                result = handlers[method](params)
-                send_response(cmd_id, True, data=result)
-            except Exception as e:
-                send_response(cmd_id, False, error=str(e))
+                cmd = _loads(message)
+                cmd_id = cmd.get('id', '')
+                method = cmd.get('method', '')
+                params = cmd.get('params', {})
+
+                # Single lookup instead of `in` + subscript
+                handler = handlers.get(method)
+                if handler is None:
+                    send_response(cmd_id, False, error=f'Unknown method: {method}')
+                    continue
+
+                try:
+                    result = handler(params)
+                    if isinstance(result, BinaryResult):
+                        send_binary(cmd_id, result)
+                    else:
+                        send_response(cmd_id, True, data=result)
+                except Exception as e:
+                    send_response(cmd_id, False, error=str(e))
+
+            except json.JSONDecodeError as e:
+                sys.stderr.write(f'Invalid JSON: {e}\n')
+                sys.stderr.flush()
+    finally:
+        # Parent went away (stdin EOF), possibly with Chrome parked between
+        # tasks: don't leave the browser running without a bridge
+        if driver:
+            driver.quit()
 
-        except json.JSONDecodeError as e:
-            sys.stderr.write(f'Invalid JSON: {e}\n')
-            sys.stderr.flush()
 
 if __name__ == '__main__':
     main()
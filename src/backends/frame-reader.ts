@@ -0,0 +1,98 @@
+/**
+ * Frame Reader for the SeleniumBase bridge
+ *
+ * Length-prefixed framing shared by stdin/stdout: each frame is the payload
+ * length as 8 hex digits + newline, followed by exactly that many bytes.
+ * Binary payloads on fd 3 carry no header, their size comes from the JSON
+ * response that announces them.
+ */
+
+import type { Readable } from 'stream';
+
+/** Frame header: payload length as 8 hex digits + newline */
+export const FRAME_HEADER_SIZE = 9;
+
+const FRAME_HEADER_RE = /^[0-9a-fA-F]{8}\n$/;
+
+/**
+ * Buffers a byte stream and hands out exact-size reads in request order.
+ * Used for length-prefixed stdout frames and fd 3 binary payloads.
+ */
+export class ByteReader {
+  private chunks: Buffer[] = [];
+  private length = 0;
+  private waiters: { len: number; resolve: (data: Buffer) => void }[] = [];
+  private draining = false;
+
+  constructor(stream: Readable) {
+    stream.on('data', (chunk: Buffer) => {
+      this.chunks.push(chunk);
+      this.length += chunk.length;
+      this.drain();
+    });
+  }
+
+  read(len: number, resolve: (data: Buffer) => void): void {
+    this.waiters.push({ len, resolve });
+    this.drain();
+  }
+
+  private drain(): void {
+    // Callbacks may queue more reads; the running loop picks them up
+    if (this.draining) return;
+    this.draining = true;
+    while (this.waiters.length > 0 && this.length >= this.waiters[0]!.len) {
+      const waiter = this.waiters.shift()!;
+      const all = this.chunks.length === 1 ? this.chunks[0]! : Buffer.concat(this.chunks, this.length);
+      const rest = all.subarray(waiter.len);
+      this.chunks = rest.length > 0 ? [rest] : [];
+      this.length = rest.length;
+      waiter.resolve(all.subarray(0, waiter.len));
+    }
+    this.draining = false;
+  }
+}
+
+/**
+ * Parse a frame header into its payload length.
+ * Returns null unless it is exactly 8 hex digits followed by a newline.
+ */
+export function parseFrameHeader(header: Buffer): number | null {
+  const text = header.toString('latin1');
+  if (!FRAME_HEADER_RE.test(text)) return null;
+  return parseInt(text.slice(0, 8), 16);
+}
+
+/**
+ * Encode a payload as one frame (header + body)
+ */
+export function encodeFrame(body: Buffer): Buffer {
+  const header = Buffer.from(body.length.toString(16).padStart(8, '0') + '\n', 'ascii');
+  return Buffer.concat([header, body]);
+}
+
+/**
+ * Read frames from the reader until a header is invalid.
+ * A bad header means the stream can't be resynchronized, so reading stops
+ * and onError gets the raw header.
+ */
+export function readFrames(
+  reader: ByteReader,
+  onFrame: (payload: Buffer) => void,
+  onError: (header: Buffer) => void
+): void {
+  const next = () => {
+    reader.read(FRAME_HEADER_SIZE, (header) => {
+      const len = parseFrameHeader(header);
+      if (len === null) {
+        onError(header);
+        return;
+      }
+      reader.read(len, (payload) => {
+        onFrame(payload);
+        next();
+      });
+    });
+  };
+  next();
+}
@@ -16,7 +16,8 @@ import { v4 as uuidv4 } from 'uuid';
 import * as fs from 'fs';
 import * as path from 'path';
 import * as os from 'os';
-import * as readline from 'readline';
+import { Readable } from 'stream';
+import * as zlib from 'zlib';
 
 import {
   IBrowserBackend,
@@ -31,6 +32,7 @@ import {
   BackendSnapshotResult,
   BackendResult,
 } from './types.js';
+import { ByteReader, encodeFrame, readFrames } from './frame-reader.js';
 
 /** Message sent to Python subprocess */
 interface PythonCommand {
@@ -45,24 +47,41 @@ interface PythonResponse {
   success: boolean;
   data?: any;
   error?: string;
+  /** Header for raw bytes sent over the binary side channel (fd 3) */
+  binary?: { len: number; mime: string };
 }
 
+/** A running bridge subprocess and its in-flight commands */
+interface BridgeProcess {
+  process: ChildProcess;
+  pending: Map<string, { resolve: (value: PythonResponse) => void; reject: (error: Error) => void }>;
+}
+
+/** How long a closed instance's bridge stays parked for reuse */
+const IDLE_BRIDGE_TTL_MS = 60000;
+
 /**
  * SeleniumBase Backend Implementation
  *
  * Uses a Python subprocess running SeleniumBase UC mode.
- * Communication is via JSON lines over stdio (no HTTP bridge).
+ * Communication is via length-prefixed JSON frames over stdio (no HTTP bridge).
+ * On POSIX, an extra pipe (fd 3) carries raw binary payloads such as
+ * screenshots, announced by a `binary` header on the JSON line.
+ * Closing an instance resets its bridge to about:blank and parks it for a
+ * while, so the next create() on the same profile skips Chrome startup.
  */
 export class SeleniumBaseBackend implements IBrowserBackend {
   readonly backendType: BackendType = 'seleniumbase';
   readonly name = 'SeleniumBase UC Mode (Chrome Stealth)';
 
-  private instances: Map<string, {
-    process: ChildProcess;
-    readline: readline.Interface;
-    pending: Map<string, { resolve: (value: PythonResponse) => void; reject: (error: Error) => void }>;
-    instance: BackendInstance;
-  }> = new Map();
+  private instances: Map<string, BridgeProcess & { instance: BackendInstance; profileDir: string }> = new Map();
+
+  /**
+   * Bridges of closed instances, reset to about:blank with Chrome still running.
+   * Keyed by profile dir: a parked Chrome holds the profile lock, so a new
+   * instance on that profile must take it over rather than start another.
+   */
+  private idle: Map<string, BridgeProcess & { timer: NodeJS.Timeout }> = new Map();
 
   private pythonScriptPath: string;
 
@@ -209,77 +228,13 @@ export class SeleniumBaseBackend implements IBrowserBackend {
         fs.mkdirSync(profileDir, { recursive: true });
       }
 
-      // Ensure Python bridge script exists
-      if (!fs.existsSync(this.pythonScriptPath)) {
-        await this.createPythonBridgeScript();
+      // Take over a parked bridge for this profile (skips Python and Chrome
+      // startup, init below only re-applies options), else spawn a new one
+      const parked = this.takeIdleBridge(profileDir);
+      if (parked) {
+        console.error(`[SeleniumBase] Reusing idle bridge for profile: ${profileDir}`);
       }
-
-      // Find Python executable and start subprocess
-      console.error('[SeleniumBase] Finding Python executable...');
-      const pythonPath = await this.findPythonPath();
-      console.error(`[SeleniumBase] Python path: ${pythonPath}`);
-      // If using py.exe launcher, add -3 flag for Python 3
-      const pythonArgs = pythonPath === 'py'
-        ? ['-3', this.pythonScriptPath]
-        : [this.pythonScriptPath];
-
-      console.error(`[SeleniumBase] Spawning process: ${pythonPath} ${pythonArgs.join(' ')}`);
-      console.error(`[SeleniumBase] Profile dir: ${profileDir}`);
-      const proc = spawn(pythonPath, pythonArgs, {
-        stdio: ['pipe', 'pipe', 'pipe'],
-        env: {
-          ...process.env,
-          HYDRA_PROFILE_DIR: profileDir,
-          HYDRA_HEADLESS: options.headless ? 'true' : 'false',
-          HYDRA_PROXY: options.proxy || '',
-          HYDRA_WINDOW_SIZE: options.windowSize
-            ? `${options.windowSize.width},${options.windowSize.height}`
-            : options.viewport
-              ? `${options.viewport.width},${options.viewport.height}`
-              : '1280,720',
-          HYDRA_WINDOW_POSITION: options.windowPosition
-            ? `${options.windowPosition.x},${options.windowPosition.y}`
-            : '',
-        },
-      });
-
-      // Set up readline for JSON line communication
-      const rl = readline.createInterface({
-        input: proc.stdout!,
-        crlfDelay: Infinity,
-      });
-
-      const pending = new Map<string, { resolve: (value: PythonResponse) => void; reject: (error: Error) => void }>();
-
-      // Handle responses
-      rl.on('line', (line) => {
-        try {
-          const response: PythonResponse = JSON.parse(line);
-          const handler = pending.get(response.id);
-          if (handler) {
-            pending.delete(response.id);
-            handler.resolve(response);
-          }
-        } catch (e) {
-          console.error('[SeleniumBase] Invalid JSON response:', line);
-        }
-      });
-
-      // Handle stderr for debugging
-      proc.stderr?.on('data', (data) => {
-        console.error('[SeleniumBase]', data.toString().trim());
-      });
-
-      // Handle process exit
-      proc.on('close', (code) => {
-        console.error(`[SeleniumBase] Process exited with code ${code}`);
-        // Reject all pending requests
-        for (const [reqId, handler] of pending) {
-          handler.reject(new Error(`Process exited with code ${code}`));
-          pending.delete(reqId);
-        }
-        this.instances.delete(id);
-      });
+      const bridge = parked ?? await this.spawnBridge(profileDir, options);
 
       // Create the BackendPage wrapper
       const backendPage: BackendPage = {
@@ -303,10 +258,10 @@ export class SeleniumBaseBackend implements IBrowserBackend {
         pages: async () => [backendPage], // SeleniumBase UC mode is single-page
         createdAt: new Date(),
         lastUsed: new Date(),
-        native: proc,
+        native: bridge.process,
       };
 
-      this.instances.set(id, { process: proc, readline: rl, pending, instance });
+      this.instances.set(id, { ...bridge, instance, profileDir });
 
       // Initialize browser
       console.error('[SeleniumBase] Process spawned, sending init command...');
@@ -322,7 +277,7 @@ export class SeleniumBaseBackend implements IBrowserBackend {
       console.error(`[SeleniumBase] Init completed in ${Date.now() - initStartTime}ms, success: ${initResult.success}`);
       if (!initResult.success) {
         console.error(`[SeleniumBase] Init failed: ${initResult.error}`);
-        await this.close(instance);
+        await this.terminate(id);
         return {
           success: false,
           error: initResult.error || 'Failed to initialize SeleniumBase',
@@ -353,13 +308,122 @@ export class SeleniumBaseBackend implements IBrowserBackend {
     }
   }
 
+  /**
+   * Spawn a bridge subprocess and wire up its framed stdout and fd 3 readers
+   */
+  private async spawnBridge(profileDir: string, options: BackendCreateOptions): Promise<BridgeProcess> {
+    // Ensure Python bridge script exists
+    if (!fs.existsSync(this.pythonScriptPath)) {
+      await this.createPythonBridgeScript();
+    }
+
+    // Find Python executable and start subprocess
+    console.error('[SeleniumBase] Finding Python executable...');
+    const pythonPath = await this.findPythonPath();
+    console.error(`[SeleniumBase] Python path: ${pythonPath}`);
+    // If using py.exe launcher, add -3 flag for Python 3
+    const pythonArgs = pythonPath === 'py'
+      ? ['-3', this.pythonScriptPath]
+      : [this.pythonScriptPath];
+
+    console.error(`[SeleniumBase] Spawning process: ${pythonPath} ${pythonArgs.join(' ')}`);
+    console.error(`[SeleniumBase] Profile dir: ${profileDir}`);
+    // Windows doesn't reliably hand extra pipes to Python, stay on base64 there
+    const binaryChannel = process.platform !== 'win32';
+    const proc = spawn(pythonPath, pythonArgs, {
+      stdio: binaryChannel ? ['pipe', 'pipe', 'pipe', 'pipe'] : ['pipe', 'pipe', 'pipe'],
+      env: {
+        ...process.env,
+        HYDRA_BINARY_FD: binaryChannel ? '3' : '',
+        HYDRA_FRAMING: 'length',
+        HYDRA_PROFILE_DIR: profileDir,
+        HYDRA_HEADLESS: options.headless ? 'true' : 'false',
+        HYDRA_PROXY: options.proxy || '',
+        HYDRA_WINDOW_SIZE: options.windowSize
+          ? `${options.windowSize.width},${options.windowSize.height}`
+          : options.viewport
+            ? `${options.viewport.width},${options.viewport.height}`
+            : '1280,720',
+        HYDRA_WINDOW_POSITION: options.windowPosition
+          ? `${options.windowPosition.x},${options.windowPosition.y}`
+          : '',
+      },
+    });
+
+    const pending = new Map<string, { resolve: (value: PythonResponse) => void; reject: (error: Error) => void }>();
+
+    // Binary payloads arrive on fd 3 in the same order as their headers
+    const binaryStream = proc.stdio[3] as Readable | undefined;
+    const binaryReader = binaryStream ? new ByteReader(binaryStream) : null;
+
+    // Handle responses
+    const handleResponse = (line: string) => {
+      try {
+        const response: PythonResponse = JSON.parse(line);
+        const handler = pending.get(response.id);
+        if (handler) {
+          pending.delete(response.id);
+        }
+        const { binary, ...rest } = response;
+        if (binary && binaryReader) {
+          // Always consume the bytes, even if the command already timed out
+          binaryReader.read(binary.len, (data) => handler?.resolve({ ...rest, data: data.toString('base64') }));
+        } else {
+          handler?.resolve(response);
+        }
+      } catch (e) {
+        console.error('[SeleniumBase] Invalid JSON response:', line);
+      }
+    };
+
+    // Read length-prefixed frames: exact-size reads, no line scanning
+    const stdoutReader = new ByteReader(proc.stdout!);
+    readFrames(
+      stdoutReader,
+      (payload) => handleResponse(payload.toString('utf-8')),
+      (header) => {
+        // The stream can't be resynchronized, give up on this process
+        console.error('[SeleniumBase] Invalid frame header:', JSON.stringify(header.toString('latin1')));
+        proc.kill();
+      }
+    );
+
+    // Handle stderr for debugging
+    proc.stderr?.on('data', (data) => {
+      console.error('[SeleniumBase]', data.toString().trim());
+    });
+
+    // Handle process exit
+    proc.on('close', (code) => {
+      console.error(`[SeleniumBase] Process exited with code ${code}`);
+      // Reject all pending requests
+      for (const [reqId, handler] of pending) {
+        handler.reject(new Error(`Process exited with code ${code}`));
+        pending.delete(reqId);
+      }
+      for (const [instanceId, stored] of this.instances) {
+        if (stored.process === proc) this.instances.delete(instanceId);
+      }
+      const idle = this.idle.get(profileDir);
+      if (idle?.process === proc) {
+        clearTimeout(idle.timer);
+        this.idle.delete(profileDir);
+      }
+    });
+
+    return { process: proc, pending };
+  }
+
   private async sendCommand(instanceId: string, method: string, params: Record<string, any>): Promise<PythonResponse> {
     const stored = this.instances.get(instanceId);
     if (!stored) {
       console.error(`[SeleniumBase] sendCommand: Instance ${instanceId} not found`);
       return { id: '', success: false, error: 'Instance not found' };
     }
+    return this.request(stored, method, params);
+  }
 
+  private request(stored: BridgeProcess, method: string, params: Record<string, any>): Promise<PythonResponse> {
     const cmdId = uuidv4();
     const command: PythonCommand = { id: cmdId, method, params };
     console.error(`[SeleniumBase] Sending command: ${method} (id: ${cmdId.slice(0, 8)})`);
@@ -367,8 +431,9 @@ export class SeleniumBaseBackend implements IBrowserBackend {
     return new Promise((resolve, reject) => {
       stored.pending.set(cmdId, { resolve, reject });
 
-      // Send command as JSON line
-      stored.process.stdin?.write(JSON.stringify(command) + '\n');
+      // Send command as a length-prefixed JSON frame
+      const body = Buffer.from(JSON.stringify(command), 'utf-8');
+      stored.process.stdin?.write(encodeFrame(body));
 
       // Timeout after 60 seconds (increased from 30)
       setTimeout(() => {
@@ -390,14 +455,127 @@ export class SeleniumBaseBackend implements IBrowserBackend {
     const script = `#!/usr/bin/env python3
 """
 SeleniumBase Bridge for HydraSpecter
-Communicates via JSON lines over stdio.
+Communicates via JSON over stdio: one message per line by default, or
+length-prefixed frames ("%08x\\n" + payload) when HYDRA_FRAMING=length.
+
+Binary payloads (screenshots) are written raw to the fd named by
+HYDRA_BINARY_FD when the parent provides one; the JSON line then only
+carries a {"binary": {"len": N, "mime": ...}} header for those bytes.
 """
 
+import base64
+import gzip
 import json
 import sys
 import os
+import time
 import traceback
 
+# orjson is much faster on large payloads (screenshots), json is the fallback
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+_b64encode = base64.b64encode
+
+# Polls inside the page, so waiting costs one WebDriver command instead of
+# a find_element round-trip every ~0.25s
+_WAIT_ELEMENT_JS = """
+const [selector, timeoutMs, done] = arguments;
+const deadline = Date.now() + timeoutMs;
+const check = () => {
+    let el;
+    try {
+        el = document.querySelector(selector);
+    } catch (e) {
+        return done('Invalid selector: ' + e.message);
+    }
+    // Same idea as WebDriver's is_displayed(): rendered and not visibility:hidden
+    const visible = el && (el.checkVisibility
+        ? el.checkVisibility({ visibilityProperty: true })
+        : el.getClientRects().length && getComputedStyle(el).visibility !== 'hidden');
+    if (visible) return done(true);
+    if (Date.now() > deadline) return done(false);
+    setTimeout(check, 50);
+};
+check();
+"""
+
+# Selector forms SeleniumBase understands but querySelector doesn't
+_NON_CSS_PREFIXES = (
+    '/', './', '(', 'xpath=', 'css=',
+    'link=', 'link_text=', 'partial_link=', 'partial_link_text=',
+)
+
+
+def _is_plain_css(selector):
+    return not selector.startswith(_NON_CSS_PREFIXES) and ':contains(' not in selector
+
+
+# Script errors chromedriver raises when the page navigates away mid-script
+_NAVIGATION_ERRORS = (
+    'document unloaded',
+    'Execution context was destroyed',
+    'Cannot find context with specified id',
+)
+
+
+def _is_navigation_error(error):
+    message = str(error)
+    return any(marker in message for marker in _NAVIGATION_ERRORS)
+
+
+FRAME_HEADER_SIZE = 9  # 8 hex digits + newline
+_HEX_DIGITS = frozenset(b'0123456789abcdefABCDEF')
+
+
+def _parse_frame_header(header):
+    """Payload length from a frame header, or None if it is malformed"""
+    if header[8:] != b'\\n' or not all(c in _HEX_DIGITS for c in header[:8]):
+        return None
+    return int(header[:8], 16)
+
+
+def read_messages(inp, framed):
+    """Yield raw JSON messages from stdin"""
+    if framed:
+        # Exact-size reads, no scanning for newlines
+        while True:
+            header = inp.read(FRAME_HEADER_SIZE)
+            if len(header) < FRAME_HEADER_SIZE:
+                return
+            length = _parse_frame_header(header)
+            if length is None:
+                # Can't resynchronize: stop reading instead of guessing
+                sys.stderr.write(f'Invalid frame header: {header!r}\\n')
+                sys.stderr.flush()
+                return
+            body = inp.read(length)
+            if len(body) < length:
+                return
+            yield body
+    else:
+        for line in iter(inp.readline, b''):
+            line = line.strip()
+            if line:
+                yield line
+
+
+class BinaryResult:
+    """Handler result sent as raw bytes over the binary side channel"""
+    __slots__ = ('data', 'mime')
+
+    def __init__(self, data, mime):
+        self.data = data
+        self.mime = mime
+
+
 def main():
     # Environment config
     profile_dir = os.environ.get('HYDRA_PROFILE_DIR', '')
@@ -407,31 +585,83 @@ def main():
     window_position = os.environ.get('HYDRA_WINDOW_POSITION', '')
 
     driver = None
+    driver_config = None
+    script_timeout = None
+    # Keep a private handle on the protocol channel, then point fd 1 at
+    # stderr: SeleniumBase and chromedriver print to stdout (e.g. driver
+    # downloads), and any stray byte there would corrupt a frame
+    sys.stdout.flush()
+    out = os.fdopen(os.dup(1), 'wb')
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    framed = os.environ.get('HYDRA_FRAMING', '') == 'length'
+
+    # Side channel for raw bytes (POSIX parents pass an extra pipe as fd 3)
+    binary_out = None
+    binary_fd = os.environ.get('HYDRA_BINARY_FD', '')
+    if binary_fd:
+        try:
+            binary_out = os.fdopen(int(binary_fd), 'wb')
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f'Binary channel unavailable: {e}\\n')
+            sys.stderr.flush()
 
-    def send_response(cmd_id, success, data=None, error=None):
+    def send_response(cmd_id, success, data=None, error=None, binary=None):
         response = {'id': cmd_id, 'success': success}
         if data is not None:
             response['data'] = data
         if error is not None:
             response['error'] = error
-        print(json.dumps(response), flush=True)
+        if binary is not None:
+            response['binary'] = binary
+        payload = _dumps(response)
+        # writelines avoids concatenating (copying) large payloads
+        if framed:
+            out.writelines((b'%08x\\n' % len(payload), payload))
+        else:
+            out.writelines((payload, b'\\n'))
+        out.flush()
+
+    def send_binary(cmd_id, result):
+        # Bytes first, so they are already in flight when the header is read
+        binary_out.write(result.data)
+        binary_out.flush()
+        send_response(cmd_id, True, binary={'len': len(result.data), 'mime': result.mime})
 
     def init_driver(params):
-        nonlocal driver
+        nonlocal driver, driver_config, script_timeout
+        # Deliberately imported here, not at module level: SeleniumBase is a
+        # heavy import, and a missing install must surface as an init error
+        # response rather than a bridge that dies before reading stdin
         from seleniumbase import Driver
 
+        # Reuse the running browser when it was launched with the same options
+        # (skips Chrome startup); window geometry is simply re-applied below
+        config = (
+            params.get('profileDir'),
+            bool(params.get('headless', False)),
+            params.get('proxy') or None,
+        )
+        if driver is not None and config != driver_config:
+            driver.quit()
+            driver = None
+
         # Parse window size
         ws = params.get('windowSize', {})
         width = ws.get('width', 1280)
         height = ws.get('height', 720)
 
-        # UC mode options
-        driver = Driver(
-            uc=True,  # Undetected Chrome mode
-            headless=params.get('headless', False),
-            user_data_dir=params.get('profileDir'),
-            proxy=params.get('proxy') or None,
-        )
+        if driver is None:
+            profile, headless, proxy = config
+            # UC mode options
+            driver = Driver(
+                uc=True,  # Undetected Chrome mode
+                headless=headless,
+                user_data_dir=profile,
+                proxy=proxy,
+            )
+            driver_config = config
+            script_timeout = None
 
         # Set window size
         driver.set_window_size(width, height)
@@ -486,17 +716,31 @@ def main():
         return True
 
     def screenshot(params):
-        import base64
-        # Take screenshot and return as base64
         png_data = driver.get_screenshot_as_png()
-        return base64.b64encode(png_data).decode('utf-8')
+        if binary_out is not None:
+            return BinaryResult(png_data, 'image/png')
+        # No side channel: return as base64
+        return _b64encode(png_data).decode('utf-8')
 
     def snapshot(params):
         format_type = params.get('format', 'html')
         if format_type == 'html':
-            return {'content': driver.page_source, 'format': 'html'}
+            result = {'content': driver.page_source, 'format': 'html'}
         else:
-            return {'content': driver.get_page_source(), 'format': 'text'}
+            result = {'content': driver.get_page_source(), 'format': 'text'}
+
+        # HTML compresses 5-10x, worth it for multi-MB pages
+        if params.get('encoding') == 'gzip':
+            result['content'] = _b64encode(gzip.compress(result['content'].encode('utf-8'))).decode('utf-8')
+            result['encoding'] = 'gzip'
+        return result
+
+    def snapshot_hash(params):
+        # Cheap change detection: computed in the page, ~30 bytes over the wire
+        length, elements = driver.execute_script(
+            "return [document.documentElement.outerHTML.length, document.getElementsByTagName('*').length]"
+        )
+        return {'length': length, 'elements': elements}
 
     def evaluate(params):
         script = params.get('script')
@@ -505,12 +749,45 @@ def main():
         return driver.execute_script(script)
 
     def wait_element(params):
+        nonlocal script_timeout
         selector = params.get('selector')
         timeout = params.get('timeout', 10)
         if not selector:
             raise ValueError('Selector required')
-        driver.wait_for_element(selector, timeout=timeout)
-        return True
+
+        # XPath, link text, :contains() etc. need SeleniumBase's own polling
+        if not _is_plain_css(selector):
+            driver.wait_for_element(selector, timeout=timeout)
+            return True
+
+        from selenium.common.exceptions import WebDriverException
+
+        # Only ever raise the driver-wide script timeout, evaluate() relies on it too
+        if script_timeout is None:
+            script_timeout = driver.timeouts.script
+        if script_timeout < timeout + 5:
+            script_timeout = timeout + 5
+            driver.set_script_timeout(script_timeout)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f'Element {selector} was not visible after {timeout} seconds')
+            try:
+                found = driver.execute_async_script(_WAIT_ELEMENT_JS, selector, int(remaining * 1000))
+            except WebDriverException as e:
+                # A navigation (e.g. after clicking submit) unloads the document
+                # mid-wait; keep polling on the new page with the time left
+                if _is_navigation_error(e):
+                    time.sleep(0.05)
+                    continue
+                raise
+            if isinstance(found, str):
+                raise ValueError(found)
+            if not found:
+                raise TimeoutError(f'Element {selector} was not visible after {timeout} seconds')
+            return True
 
     def scroll(params):
         if 'selector' in params:
@@ -524,11 +801,21 @@ def main():
                 driver.execute_script(f'window.scrollBy(0, -{amount})')
         return True
 
+    def reset(params):
+        # Return to a blank page between tasks without tearing down Chrome
+        if not driver:
+            raise ValueError('Driver not initialized')
+        driver.execute_script('window.stop()')
+        driver.get('about:blank')
+        return True
+
     def close(params):
-        nonlocal driver
+        nonlocal driver, driver_config, script_timeout
         if driver:
             driver.quit()
             driver = None
+            driver_config = None
+            script_timeout = None
         return True
 
     def get_url(params):
@@ -542,6 +829,26 @@ def main():
         driver.uc_gui_click_captcha()
         return True
 
+    def batch(params):
+        # Run several commands in one round-trip, stopping at the first failure
+        results = []
+        for op in params.get('ops', []):
+            method = op.get('method', '')
+            handler = handlers.get(method)
+            if handler is None:
+                results.append({'success': False, 'error': f'Unknown method: {method}'})
+                break
+            try:
+                result = handler(op.get('params', {}))
+            except Exception as e:
+                results.append({'success': False, 'error': str(e)})
+                break
+            if isinstance(result, BinaryResult):
+                # Binary results can't share one frame, inline them as base64
+                result = _b64encode(result.data).decode('utf-8')
+            results.append({'success': True, 'data': result})
+        return {'results': results}
+
     # Command handlers
     handlers = {
         'init': init_driver,
@@ -551,40 +858,51 @@ def main():
         'fill': fill,
         'screenshot': screenshot,
         'snapshot': snapshot,
+        'snapshot_hash': snapshot_hash,
         'evaluate': evaluate,
         'wait_element': wait_element,
         'scroll': scroll,
+        'reset': reset,
         'close': close,
         'get_url': get_url,
         'get_title': get_title,
         'solve_turnstile': solve_turnstile,
+        'batch': batch,
     }
 
     # Main loop: read JSON commands from stdin
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
-
-        try:
-            cmd = json.loads(line)
-            cmd_id = cmd.get('id', '')
-            method = cmd.get('method', '')
-            params = cmd.get('params', {})
-
-            if method not in handlers:
-                send_response(cmd_id, False, error=f'Unknown method: {method}')
-                continue
-
+    try:
+        for message in read_messages(sys.stdin.buffer, framed):
             try:
-                result = handlers[method](params)
-                send_response(cmd_id, True, data=result)
-            except Exception as e:
-                send_response(cmd_id, False, error=str(e))
+                cmd = _loads(message)
+                cmd_id = cmd.get('id', '')
+                method = cmd.get('method', '')
+                params = cmd.get('params', {})
+
+                # Single lookup instead of \`in\` + subscript
+                handler = handlers.get(method)
+                if handler is None:
+                    send_response(cmd_id, False, error=f'Unknown method: {method}')
+                    continue
+
+                try:
+                    result = handler(params)
+                    if isinstance(result, BinaryResult):
+                        send_binary(cmd_id, result)
+                    else:
+                        send_response(cmd_id, True, data=result)
+                except Exception as e:
+                    send_response(cmd_id, False, error=str(e))
+
+            except json.JSONDecodeError as e:
+                sys.stderr.write(f'Invalid JSON: {e}\\n')
+                sys.stderr.flush()
+    finally:
+        # Parent went away (stdin EOF), possibly with Chrome parked between
+        # tasks: don't leave the browser running without a bridge
+        if driver:
+            driver.quit()
 
-        except json.JSONDecodeError as e:
-            sys.stderr.write(f'Invalid JSON: {e}\\n')
-            sys.stderr.flush()
 
 if __name__ == '__main__':
     main()
@@ -627,9 +945,40 @@ if __name__ == '__main__':
     return result.success ? { success: true, data: result.data } : { success: false, error: result.error };
   }
 
-  async snapshot(backendPage: BackendPage, options: { format?: 'aria' | 'html' | 'text' } = {}): Promise<BackendResult<BackendSnapshotResult>> {
+  /**
+   * Page snapshot. `encoding: 'gzip'` has the bridge gzip the content before
+   * sending (HTML compresses 5-10x); it is decoded here, callers always get text.
+   */
+  async snapshot(
+    backendPage: BackendPage,
+    options: { format?: 'aria' | 'html' | 'text'; encoding?: 'gzip' } = {}
+  ): Promise<BackendResult<BackendSnapshotResult>> {
+    const instanceId = (backendPage.native as any).instanceId;
+    const params: Record<string, any> = { format: options.format || 'html' };
+    if (options.encoding) {
+      params['encoding'] = options.encoding;
+    }
+    const result = await this.sendCommand(instanceId, 'snapshot', params);
+    if (!result.success) {
+      return { success: false, error: result.error };
+    }
+    if (result.data?.encoding === 'gzip') {
+      const { encoding: _encoding, content, ...rest } = result.data;
+      return {
+        success: true,
+        data: { ...rest, content: zlib.gunzipSync(Buffer.from(content, 'base64')).toString('utf-8') },
+      };
+    }
+    return { success: true, data: result.data };
+  }
+
+  /**
+   * Cheap page fingerprint (HTML length + element count) for change detection,
+   * avoids transferring the full page source
+   */
+  async snapshotHash(backendPage: BackendPage): Promise<BackendResult<{ length: number; elements: number }>> {
     const instanceId = (backendPage.native as any).instanceId;
-    const result = await this.sendCommand(instanceId, 'snapshot', { format: options.format || 'html' });
+    const result = await this.sendCommand(instanceId, 'snapshot_hash', {});
     return result.success ? { success: true, data: result.data } : { success: false, error: result.error };
   }
 
@@ -665,10 +1014,16 @@ if __name__ == '__main__':
     try {
       const stored = this.instances.get(instance.id);
       if (stored) {
-        await this.sendCommand(instance.id, 'close', {});
-        stored.process.kill();
-        stored.readline.close();
-        this.instances.delete(instance.id);
+        // Park the bridge for the next instance on this profile instead of
+        // quitting Chrome; one parked bridge per profile is enough
+        if (stored.process.exitCode === null && !this.idle.has(stored.profileDir)) {
+          const result = await this.request(stored, 'reset', {});
+          if (result.success && this.instances.delete(instance.id)) {
+            this.parkBridge(stored.profileDir, stored);
+            return { success: true };
+          }
+        }
+        await this.terminate(instance.id);
       }
       return { success: true };
     } catch (error) {
@@ -679,6 +1034,38 @@ if __name__ == '__main__':
     }
   }
 
+  /**
+   * Quit Chrome and stop the bridge of a live instance
+   */
+  private async terminate(instanceId: string): Promise<void> {
+    const stored = this.instances.get(instanceId);
+    if (!stored) return;
+    await this.request(stored, 'close', {});
+    stored.process.kill();
+    this.instances.delete(instanceId);
+  }
+
+  private parkBridge(profileDir: string, bridge: BridgeProcess): void {
+    const timer = setTimeout(() => {
+      if (this.idle.get(profileDir)?.process !== bridge.process) return;
+      this.idle.delete(profileDir);
+      void this.request(bridge, 'close', {})
+        .catch(() => undefined)
+        .then(() => bridge.process.kill());
+    }, IDLE_BRIDGE_TTL_MS);
+    // A parked bridge must not keep the server alive
+    timer.unref();
+    this.idle.set(profileDir, { process: bridge.process, pending: bridge.pending, timer });
+  }
+
+  private takeIdleBridge(profileDir: string): BridgeProcess | undefined {
+    const idle = this.idle.get(profileDir);
+    if (!idle) return undefined;
+    clearTimeout(idle.timer);
+    this.idle.delete(profileDir);
+    return { process: idle.process, pending: idle.pending };
+  }
+
   /**
    * Solve Cloudflare Turnstile challenge using UC GUI click
    */
@@ -687,4 +1074,27 @@ if __name__ == '__main__':
     const result = await this.sendCommand(instanceId, 'solve_turnstile', {});
     return result.success ? { success: true } : { success: false, error: result.error };
   }
+
+  /**
+   * Run several bridge commands in one round-trip (e.g. navigate, wait_element,
+   * type, click). Stops at the first failing op.
+   */
+  async batch(
+    backendPage: BackendPage,
+    ops: { method: string; params?: Record<string, any> }[]
+  ): Promise<BackendResult<{ success: boolean; data?: any; error?: string }[]>> {
+    const instanceId = (backendPage.native as any).instanceId;
+    const result = await this.sendCommand(instanceId, 'batch', { ops });
+    return result.success ? { success: true, data: result.data.results } : { success: false, error: result.error };
+  }
+
+  /**
+   * Reset to about:blank between tasks, keeping Chrome running
+   * (cheaper than close + create, which pays full Chrome startup)
+   */
+  async reset(backendPage: BackendPage): Promise<BackendResult<void>> {
+    const instanceId = (backendPage.native as any).instanceId;
+    const result = await this.sendCommand(instanceId, 'reset', {});
+    return result.success ? { success: true } : { success: false, error: result.error };
+  }
 }
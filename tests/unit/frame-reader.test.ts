@@ -0,0 +1,141 @@
+import { describe, it, expect, beforeEach } from 'vitest';
+import { PassThrough } from 'stream';
+import {
+  ByteReader,
+  FRAME_HEADER_SIZE,
+  encodeFrame,
+  parseFrameHeader,
+  readFrames,
+} from '../../src/backends/frame-reader.js';
+
+const frame = (text: string) => encodeFrame(Buffer.from(text, 'utf-8'));
+
+describe('parseFrameHeader', () => {
+  it('should parse 8 hex digits and a newline', () => {
+    expect(parseFrameHeader(Buffer.from('0000001a\n'))).toBe(26);
+    expect(parseFrameHeader(Buffer.from('0000001A\n'))).toBe(26);
+    expect(parseFrameHeader(Buffer.from('00000000\n'))).toBe(0);
+  });
+
+  it('should reject partial hex', () => {
+    expect(parseFrameHeader(Buffer.from('0000001g\n'))).toBeNull();
+    expect(parseFrameHeader(Buffer.from(' 000001a\n'))).toBeNull();
+    expect(parseFrameHeader(Buffer.from('-000001a\n'))).toBeNull();
+  });
+
+  it('should reject a header without its newline', () => {
+    expect(parseFrameHeader(Buffer.from('0000001a0'))).toBeNull();
+    expect(parseFrameHeader(Buffer.from('0000001a'))).toBeNull();
+  });
+
+  it('should round-trip encodeFrame', () => {
+    const encoded = frame('{"id":"1"}');
+    expect(encoded.length).toBe(FRAME_HEADER_SIZE + 10);
+    expect(parseFrameHeader(encoded.subarray(0, FRAME_HEADER_SIZE))).toBe(10);
+  });
+});
+
+describe('readFrames', () => {
+  let stream: PassThrough;
+  let frames: string[];
+  let errors: string[];
+
+  beforeEach(() => {
+    stream = new PassThrough();
+    frames = [];
+    errors = [];
+    readFrames(
+      new ByteReader(stream),
+      (payload) => frames.push(payload.toString('utf-8')),
+      (header) => errors.push(header.toString('latin1'))
+    );
+  });
+
+  it('should reassemble a frame split across chunks', () => {
+    const data = frame('{"id":"split","result":"ok"}');
+    for (let i = 0; i < data.length; i += 3) {
+      stream.write(data.subarray(i, i + 3));
+    }
+    expect(frames).toEqual(['{"id":"split","result":"ok"}']);
+  });
+
+  it('should split several frames arriving in one chunk', () => {
+    stream.write(Buffer.concat([frame('a'), frame(''), frame('ccc')]));
+    expect(frames).toEqual(['a', '', 'ccc']);
+  });
+
+  it('should keep a trailing partial frame until the rest arrives', () => {
+    const second = frame('second');
+    stream.write(Buffer.concat([frame('first'), second.subarray(0, 5)]));
+    expect(frames).toEqual(['first']);
+    stream.write(second.subarray(5));
+    expect(frames).toEqual(['first', 'second']);
+  });
+
+  it('should stop at an invalid header', () => {
+    stream.write(Buffer.concat([frame('ok'), Buffer.from('0000001g\n'), frame('never')]));
+    expect(frames).toEqual(['ok']);
+    expect(errors).toEqual(['0000001g\n']);
+  });
+
+  it('should stop at a header missing its newline', () => {
+    stream.write(Buffer.from('000000020{}'));
+    expect(frames).toEqual([]);
+    expect(errors).toEqual(['000000020']);
+  });
+});
+
+describe('ByteReader binary channel', () => {
+  let stdout: PassThrough;
+  let binary: PassThrough;
+  let results: { id: string; data?: string }[];
+
+  // Mirrors seleniumbase-backend: a header announces a payload on fd 3
+  beforeEach(() => {
+    stdout = new PassThrough();
+    binary = new PassThrough();
+    results = [];
+    const binaryReader = new ByteReader(binary);
+    readFrames(
+      new ByteReader(stdout),
+      (payload) => {
+        const response = JSON.parse(payload.toString('utf-8')) as { id: string; binary?: { len: number } };
+        if (response.binary) {
+          binaryReader.read(response.binary.len, (data) =>
+            results.push({ id: response.id, data: data.toString('base64') })
+          );
+        } else {
+          results.push({ id: response.id });
+        }
+      },
+      () => {}
+    );
+  });
+
+  const header = (id: string, len: number) => frame(JSON.stringify({ id, binary: { len, mime: 'image/png' } }));
+
+  it('should pair a payload that arrives before its header', () => {
+    binary.write(Buffer.from([1, 2, 3, 4]));
+    expect(results).toEqual([]);
+    stdout.write(header('shot', 4));
+    expect(results).toEqual([{ id: 'shot', data: Buffer.from([1, 2, 3, 4]).toString('base64') }]);
+  });
+
+  it('should pair a payload that arrives after its header', () => {
+    stdout.write(header('shot', 4));
+    binary.write(Buffer.from([1, 2]));
+    expect(results).toEqual([]);
+    binary.write(Buffer.from([3, 4]));
+    expect(results).toEqual([{ id: 'shot', data: Buffer.from([1, 2, 3, 4]).toString('base64') }]);
+  });
+
+  it('should hand out back-to-back payloads in header order', () => {
+    binary.write(Buffer.from([1, 2, 3, 9, 8]));
+    stdout.write(Buffer.concat([header('a', 3), frame('{"id":"plain"}'), header('b', 2)]));
+    expect(results).toEqual([
+      { id: 'a', data: Buffer.from([1, 2, 3]).toString('base64') },
+      { id: 'plain' },
+      { id: 'b', data: Buffer.from([9, 8]).toString('base64') },
+    ]);
+  });
+});